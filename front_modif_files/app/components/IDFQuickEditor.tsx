@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import axios from 'axios';
 
 const API_BASE_URL = 'http://localhost:8000';
@@ -8,42 +8,76 @@ interface IDFQuickEditorProps {
   onChange: (value: string) => void;
 }
 
-type IdfObjects = {
-  [key: string]: { fields: { [key: string]: string | number } }[];
-};
+type IdfField = { index: number; name: string; value: string };
+
+type IdfInstance = { fields: IdfField[] };
+
+type IdfObjectType = { object_type: string; count: number };
 
 const IDFQuickEditor: React.FC<IDFQuickEditorProps> = ({ fileId, onChange }) => {
-  const [objects, setObjects] = useState<IdfObjects>({});
+  const [types, setTypes] = useState<IdfObjectType[]>([]);
+  const [instances, setInstances] = useState<IdfInstance[]>([]);
   const [selectedType, setSelectedType] = useState<string>('');
   const [selectedInstance, setSelectedInstance] = useState<number>(0);
   const [selectedField, setSelectedField] = useState<string>('');
   const [newValue, setNewValue] = useState<string>('');
   const [error, setError] = useState<string>('');
   const [isLoading, setIsLoading] = useState<boolean>(false);
+  // Dernière requête d'instances : les réponses arrivant pour un autre fichier ou type sont ignorées
+  const requestedInstances = useRef<string>('');
 
   useEffect(() => {
-    if (!fileId) return;
-    const fetchObjects = async () => {
+    // Nouveau fichier : la sélection du fichier précédent n'a plus de sens
+    requestedInstances.current = '';
+    setTypes([]);
+    setInstances([]);
+    setSelectedType('');
+    setSelectedInstance(0);
+    setSelectedField('');
+    setNewValue('');
+    if (!fileId) {
+      setIsLoading(false);
+      return;
+    }
+    let cancelled = false;
+    const fetchTypes = async () => {
       setIsLoading(true);
       setError('');
       try {
-        const response = await axios.get(`${API_BASE_URL}/get_idf_objects/${fileId}`);
-        setObjects(response.data);
+        const response = await axios.get(`${API_BASE_URL}/idf_index/${fileId}/types`);
+        if (!cancelled) setTypes(response.data);
       } catch (err: any) {
+        if (cancelled) return;
         setError('Erreur de chargement des objets IDF: ' + (err.response?.data?.detail || err.message));
-        setObjects({});
+        setTypes([]);
       } finally {
-        setIsLoading(false);
+        if (!cancelled) setIsLoading(false);
       }
     };
-    fetchObjects();
+    fetchTypes();
+    return () => { cancelled = true; };
   }, [fileId]);
 
-  const types = Object.keys(objects);
-  const instances = selectedType ? objects[selectedType] : [];
-  const instanceNames = instances.map((inst, idx) => inst.fields?.Name || `Instance ${idx + 1}`);
-  const fields = selectedType && instances[selectedInstance] ? Object.keys(instances[selectedInstance].fields) : [];
-  const currentValue = selectedField ? (instances[selectedInstance]?.fields[selectedField] ?? '') : '';
+  // Les instances ne sont chargées que pour le type sélectionné
+  const fetchInstances = async (objectType: string) => {
+    const requestKey = `${fileId}/${objectType}`;
+    requestedInstances.current = requestKey;
+    setInstances([]);
+    if (!objectType) return;
+    try {
+      const response = await axios.get(`${API_BASE_URL}/idf_index/${fileId}/objects/${encodeURIComponent(objectType)}`);
+      if (requestedInstances.current !== requestKey) return;
+      setInstances(response.data);
+    } catch (err: any) {
+      if (requestedInstances.current !== requestKey) return;
+      setError('Erreur de chargement des objets IDF: ' + (err.response?.data?.detail || err.message));
+      setInstances([]);
+    }
+  };
+
+  const instanceNames = instances.map((inst, idx) => inst.fields.find(f => f.name === 'Name')?.value || `Instance ${idx + 1}`);
+  const fields = selectedType && instances[selectedInstance] ? instances[selectedInstance].fields : [];
+  const currentValue = selectedField ? (fields.find(f => String(f.index) === selectedField)?.value ?? '') : '';
 
   const handleEdit = async () => {
     if (!selectedType || !selectedField) {
@@ -53,17 +87,17 @@ const IDFQuickEditor: React.FC<IDFQuickEditorProps> = ({ fileId, onChange }) =>
     setError('');
     setIsLoading(true);
     try {
-      const response = await axios.post(`${API_BASE_URL}/update_idf_field/${fileId}`, {
+      // Le champ est désigné par sa position : aucun nom de champ eppy n'est nécessaire
+      const response = await axios.post(`${API_BASE_URL}/idf_index/${fileId}/update_field`, {
         object_type: selectedType,
         object_index: selectedInstance,
-        field_name: selectedField,
+        field_index: Number(selectedField),
         new_value: newValue,
       });
       // Mettre à jour le contenu dans l'éditeur principal
       onChange(response.data.new_content);
       // Re-synchroniser les objets pour voir la nouvelle valeur
-      const updatedObjects = await axios.get(`${API_BASE_URL}/get_idf_objects/${fileId}`);
-      setObjects(updatedObjects.data);
+      await fetchInstances(selectedType);
       setNewValue(''); // Reset input field
     } catch (err: any) {
       setError('Erreur de mise à jour: ' + (err.response?.data?.detail || err.message));
@@ -91,10 +125,11 @@ const IDFQuickEditor: React.FC<IDFQuickEditorProps> = ({ fileId, onChange }) =>
               setSelectedType(e.target.value);
               setSelectedInstance(0);
               setSelectedField('');
+              fetchInstances(e.target.value);
             }}
           >
             <option value="">-- Type d'objet --</option>
-            {types.map(type => <option key={type} value={type} className="truncate max-w-xs">{type}</option>)}
+            {types.map(({ object_type, count }) => <option key={object_type} value={object_type} className="truncate max-w-xs">{object_type} ({count})</option>)}
           </select>
 
           {selectedType && (
@@ -118,7 +153,7 @@ const IDFQuickEditor: React.FC<IDFQuickEditorProps> = ({ fileId, onChange }) =>
               onChange={e => setSelectedField(e.target.value)}
             >
               <option value="">-- Champ --</option>
-              {fields.map(field => <option key={field} value={field} className="truncate max-w-xs">{field}</option>)}
+              {fields.map(field => <option key={field.index} value={String(field.index)} className="truncate max-w-xs">{field.name}</option>)}
             </select>
           )}
         </div>